@@ -7,6 +7,7 @@ Contains all configurable constants and settings.
 APP_TITLE = "NER Annotation Tool"
 TEXT_FILES_DIR = "text_files"
 ANNOTATIONS_DIR = "annotations"
+STATS_FILE = "stats.json"  # Persisted corpus statistics
 AUTO_SAVE_INTERVAL_MS = 2000  # Auto-save interval in milliseconds
 
 # NER classes
@@ -18,6 +18,7 @@ from conf import (
     FLASK_APP_CONFIG,
     AUTO_SAVE_INTERVAL_MS,
 )
+from stats import init_stats, save_annotations, get_stats, rebuild_stats
 
 app = Flask(__name__)
 
@@ -25,6 +26,9 @@ app = Flask(__name__)
 os.makedirs(TEXT_FILES_DIR, exist_ok=True)
 os.makedirs(ANNOTATIONS_DIR, exist_ok=True)
 
+# Load persisted statistics (or build them once from existing annotations)
+init_stats()
+
 # HTML Template
 HTML_TEMPLATE = (
     """
@@ -149,6 +153,11 @@ HTML_TEMPLATE = (
     <h1>"""
     + APP_TITLE
     + """</h1>
+    <p>
+        <label for="annotator">Annotator:</label>
+        <input type="text" id="annotator" placeholder="Your name">
+        <a href="/dashboard">Progress dashboard</a>
+    </p>
     
     <div class="container">
         <div class="file-list">
@@ -204,6 +213,13 @@ HTML_TEMPLATE = (
         let pendingSave = false;
         let currentSelection = null;
         
+        // Annotator name, remembered across page loads
+        const annotatorInput = document.getElementById('annotator');
+        annotatorInput.value = localStorage.getItem('annotator') || '';
+        annotatorInput.addEventListener('change', function() {
+            localStorage.setItem('annotator', annotatorInput.value.trim());
+        });
+        
         // Color mapping for NER classes
         const bgColors = {{ bg_colors|tojson }};
         const textColors = {{ text_colors|tojson }};
@@ -447,7 +463,8 @@ HTML_TEMPLATE = (
                 },
                 body: JSON.stringify({
                     file: currentFile,
-                    annotations: annotations
+                    annotations: annotations,
+                    annotator: annotatorInput.value.trim()
                 }),
             })
             .then(response => response.json())
@@ -464,6 +481,90 @@ HTML_TEMPLATE = (
 """
 )
 
+# Dashboard HTML Template
+DASHBOARD_TEMPLATE = (
+    """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>"""
+    + APP_TITLE
+    + """ - Progress</title>
+    <style>
+        body {
+            font-family: """
+    + UI_STYLES["BODY_FONT"]
+    + """;
+            margin: 20px;
+            line-height: 1.6;
+        }
+        h1 {
+            margin-bottom: 25px;
+            font-size: 24px;
+        }
+        table {
+            border-collapse: collapse;
+            margin-bottom: 20px;
+            font-size: 0.9em;
+        }
+        th, td {
+            border-bottom: 1px solid #eee;
+            padding: 6px 12px;
+            text-align: left;
+        }
+        .class-label {
+            padding: 2px 6px;
+            border-radius: 3px;
+            font-weight: bold;
+        }
+    </style>
+</head>
+<body>
+    <h1>"""
+    + APP_TITLE
+    + """ - Progress</h1>
+    <p><a href="/">Back to annotation</a></p>
+
+    <h3>Documents</h3>
+    <table>
+        <tr><th>Total</th><td>{{ stats.total_documents }}</td></tr>
+        <tr><th>Annotated</th><td>{{ stats.annotated_documents }}</td></tr>
+        <tr><th>Remaining</th><td>{{ stats.remaining_documents }}</td></tr>
+        <tr><th>Spans</th><td>{{ stats.total_spans }}</td></tr>
+    </table>
+
+    <h3>Spans per Class</h3>
+    <table>
+        {% for cls, count in stats.spans_per_class|dictsort %}
+        <tr>
+            <td>
+                <span class="class-label"
+                    style="background-color: {{ class_colors.get(cls, ('"""
+    + UI_STYLES["FALLBACK_COLOR"]
+    + """', 'black'))[0] }}; color: {{ class_colors.get(cls, ('', 'black'))[1] }}">
+                {{ cls }}
+                </span>
+            </td>
+            <td>{{ count }}</td>
+        </tr>
+        {% endfor %}
+    </table>
+
+    <h3>Spans Added per Annotator per Day</h3>
+    <p>Saves made without an annotator name are listed under the client address.</p>
+    <table>
+        <tr><th>Annotator</th><th>Day</th><th>Spans added</th></tr>
+        {% for annotator, days in stats.spans_added_per_annotator_per_day|dictsort %}
+            {% for day, count in days|dictsort %}
+            <tr><td>{{ annotator }}</td><td>{{ day }}</td><td>{{ count }}</td></tr>
+            {% endfor %}
+        {% endfor %}
+    </table>
+</body>
+</html>
+"""
+)
+
 
 def get_file_list():
     """Get list of text files and annotated files"""
@@ -541,21 +642,72 @@ def index():
 @app.route("/save", methods=["POST"])
 def save():
     """Save annotations to a JSON file"""
-    data = request.json
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({"success": False, "error": "Invalid request"})
+
     file_name = data.get("file", "")
     annotations = data.get("annotations", [])
 
     if not file_name:
         return jsonify({"success": False, "error": "No file specified"})
 
-    # Save annotations to JSON file with Unicode characters preserved
+    # Only annotate existing text files, and never write outside ANNOTATIONS_DIR
+    if (
+        not isinstance(file_name, str)
+        or os.path.basename(file_name) != file_name
+        or not file_name.endswith(".txt")
+        or not os.path.isfile(os.path.join(TEXT_FILES_DIR, file_name))
+    ):
+        return jsonify({"success": False, "error": "Unknown file"})
+
+    if not isinstance(annotations, list) or not all(
+        isinstance(ann, dict) for ann in annotations
+    ):
+        return jsonify({"success": False, "error": "Invalid annotations"})
+
+    # Fall back to the client address when no annotator name is given
+    annotator = data.get("annotator")
+    if isinstance(annotator, str) and annotator.strip():
+        annotator = annotator.strip()
+    else:
+        annotator = request.remote_addr or "unknown"
+
+    # Save annotations and update statistics with the span delta for this document
     annotation_path = os.path.join(ANNOTATIONS_DIR, f"{file_name}.json")
-    with open(annotation_path, "w", encoding="utf-8") as f:
-        json.dump(annotations, f, indent=2, ensure_ascii=False)
+    save_annotations(annotation_path, annotations, annotator)
+
+    return jsonify({"success": True})
+
+
+@app.route("/stats")
+def stats_json():
+    """Return corpus statistics as JSON"""
+    return jsonify(get_stats())
 
+
+@app.route("/stats/rebuild", methods=["POST"])
+def stats_rebuild():
+    """Recompute statistics from the annotation files"""
+    rebuild_stats()
     return jsonify({"success": True})
 
 
+@app.route("/dashboard")
+def dashboard():
+    """Progress dashboard page handler"""
+    bg_colors, text_colors = generate_colors()
+    class_colors = {
+        cls: (bg, text) for cls, bg, text in zip(NER_CLASSES, bg_colors, text_colors)
+    }
+
+    return render_template_string(
+        DASHBOARD_TEMPLATE,
+        stats=get_stats(),
+        class_colors=class_colors,
+    )
+
+
 if __name__ == "__main__":
     # Create text_files directory if it doesn't exist
     os.makedirs(TEXT_FILES_DIR, exist_ok=True)
@@ -0,0 +1,243 @@
+"""
+Corpus statistics for EntityTagger.
+Keeps aggregate counts up to date from each save and persists them to disk.
+"""
+
+import copy
+import json
+import os
+import threading
+from collections import Counter
+from datetime import date
+
+from conf import TEXT_FILES_DIR, ANNOTATIONS_DIR, STATS_FILE
+
+_lock = threading.Lock()
+_stats = None
+_text_dir_mtime = None
+
+
+def _empty_stats():
+    """Return a fresh statistics structure"""
+    return {
+        "total_documents": 0,
+        "annotated_documents": 0,
+        "total_spans": 0,
+        "spans_per_class": {},
+        "spans_added_per_annotator_per_day": {},
+    }
+
+
+def _count_classes(annotations):
+    """Count spans per NER class in a list of annotations"""
+    return Counter(
+        ann.get("class", "") for ann in annotations if isinstance(ann, dict)
+    )
+
+
+def _span_keys(annotations):
+    """Count spans by position and class, so re-drawn spans count as new"""
+    return Counter(
+        (ann.get("start"), ann.get("end"), ann.get("class", ""))
+        for ann in annotations
+        if isinstance(ann, dict)
+    )
+
+
+def _count_text_files():
+    """Count the text files available for annotation"""
+    return sum(1 for f in os.listdir(TEXT_FILES_DIR) if f.endswith(".txt"))
+
+
+def _has_text_file(annotation_name):
+    """Check that an annotation file belongs to an existing text file"""
+    return os.path.isfile(os.path.join(TEXT_FILES_DIR, annotation_name[:-5]))
+
+
+def _count_annotated_documents():
+    """Count annotation files whose text file exists, without parsing them"""
+    return sum(
+        1
+        for f in os.listdir(ANNOTATIONS_DIR)
+        if f.endswith(".json") and _has_text_file(f)
+    )
+
+
+def _latest_annotation_mtime():
+    """Return the newest modification time of any annotation file, without parsing"""
+    return max(
+        (
+            os.stat(os.path.join(ANNOTATIONS_DIR, f)).st_mtime
+            for f in os.listdir(ANNOTATIONS_DIR)
+            if f.endswith(".json")
+        ),
+        default=0,
+    )
+
+
+def _read_annotations(annotation_path):
+    """Load an annotation file, returning None if it cannot be parsed"""
+    try:
+        with open(annotation_path, "r", encoding="utf-8") as f:
+            annotations = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return annotations if isinstance(annotations, list) else None
+
+
+def _rebuild(previous=None):
+    """Compute statistics by scanning every annotation file"""
+    stats = _empty_stats()
+    # Per-annotator history cannot be recovered from the files, so keep what we had
+    history = (previous or {}).get("spans_added_per_annotator_per_day")
+    if isinstance(history, dict):
+        stats["spans_added_per_annotator_per_day"] = history
+    class_counts = Counter()
+    for f in os.listdir(ANNOTATIONS_DIR):
+        if not f.endswith(".json") or not _has_text_file(f):
+            continue
+        annotations = _read_annotations(os.path.join(ANNOTATIONS_DIR, f))
+        class_counts.update(_count_classes(annotations or []))
+        stats["annotated_documents"] += 1
+    stats["spans_per_class"] = dict(class_counts)
+    stats["total_spans"] = sum(class_counts.values())
+    stats["total_documents"] = _count_text_files()
+    stats["annotations_latest_mtime"] = _latest_annotation_mtime()
+    return stats
+
+
+def _persist():
+    """Write statistics to disk atomically"""
+    # The directory mtime catches files that are created, replaced or deleted later
+    # (including a crash before the next persist); annotations_latest_mtime,
+    # kept up to date by each save, catches files rewritten in place
+    _stats["annotations_mtime"] = os.stat(ANNOTATIONS_DIR).st_mtime
+    tmp_path = STATS_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(_stats, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, STATS_FILE)
+
+
+def _is_current(stats):
+    """Check that persisted statistics are complete and match ANNOTATIONS_DIR"""
+    return (
+        isinstance(stats, dict)
+        and all(key in stats for key in _empty_stats())
+        and stats.get("annotations_mtime") == os.stat(ANNOTATIONS_DIR).st_mtime
+        and stats.get("annotations_latest_mtime") == _latest_annotation_mtime()
+    )
+
+
+def _load():
+    """Load persisted statistics, rebuilding them if missing, corrupt or stale"""
+    global _stats
+    if _stats is not None:
+        return
+    persisted = None
+    try:
+        with open(STATS_FILE, "r", encoding="utf-8") as f:
+            persisted = json.load(f)
+    except (OSError, ValueError):
+        pass
+    if _is_current(persisted):
+        _stats = persisted
+    else:
+        _stats = _rebuild(persisted if isinstance(persisted, dict) else None)
+        _persist()
+
+
+def rebuild_stats():
+    """Recompute statistics from the annotation files, e.g. after editing them by hand"""
+    global _stats
+    with _lock:
+        _stats = _rebuild(_stats)
+        _persist()
+
+
+def init_stats():
+    """Load statistics at startup so saves never race a rebuild"""
+    with _lock:
+        _load()
+
+
+def _refresh_document_total():
+    """Recount documents only when the text directory has changed"""
+    global _text_dir_mtime
+    mtime = os.stat(TEXT_FILES_DIR).st_mtime
+    if mtime != _text_dir_mtime:
+        _stats["total_documents"] = _count_text_files()
+        # Text files may have been removed from under existing annotations
+        _stats["annotated_documents"] = _count_annotated_documents()
+        _text_dir_mtime = mtime
+
+
+def _write_annotations(annotation_path, annotations):
+    """Write an annotation file atomically with Unicode characters preserved"""
+    tmp_path = annotation_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(annotations, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, annotation_path)
+
+
+def save_annotations(annotation_path, annotations, annotator):
+    """Write a document's annotations and apply the span delta to the statistics"""
+    global _stats
+    with _lock:
+        _load()
+        is_new_document = not os.path.exists(annotation_path)
+        old_annotations = []
+        if not is_new_document:
+            old_annotations = _read_annotations(annotation_path)
+
+        _write_annotations(annotation_path, annotations)
+        _stats["annotations_latest_mtime"] = max(
+            _stats.get("annotations_latest_mtime", 0),
+            os.stat(annotation_path).st_mtime,
+        )
+
+        # The previous file was unreadable, so there is no delta to apply
+        if old_annotations is None:
+            _stats = _rebuild(_stats)
+            _persist()
+            return
+
+        if is_new_document:
+            _stats["annotated_documents"] += 1
+
+        delta = _count_classes(annotations)
+        delta.subtract(_count_classes(old_annotations))
+
+        per_class = _stats["spans_per_class"]
+        for cls, change in delta.items():
+            if change:
+                per_class[cls] = per_class.get(cls, 0) + change
+                if per_class[cls] == 0:
+                    del per_class[cls]
+
+        _stats["total_spans"] += sum(delta.values())
+
+        # Credit the annotator with spans added, including moved or reclassified ones
+        added = sum((_span_keys(annotations) - _span_keys(old_annotations)).values())
+        if added:
+            per_day = _stats["spans_added_per_annotator_per_day"].setdefault(
+                annotator, {}
+            )
+            today = date.today().isoformat()
+            per_day[today] = per_day.get(today, 0) + added
+
+        _persist()
+
+
+def get_stats():
+    """Return the current corpus statistics"""
+    with _lock:
+        _load()
+        _refresh_document_total()
+        stats = copy.deepcopy(_stats)
+        del stats["annotations_mtime"]
+        del stats["annotations_latest_mtime"]
+        return {
+            **stats,
+            "remaining_documents": _stats["total_documents"]
+            - _stats["annotated_documents"],
+        }